@@ -1,16 +1,105 @@
 """
 Custom social account adapter to prevent silent account merging and hijacking.
 """
+from urllib.parse import urlparse, quote
+
 from allauth.socialaccount.adapter import DefaultSocialAccountAdapter
 from allauth.account.adapter import DefaultAccountAdapter
+from allauth.socialaccount.models import SocialAccount
 from django.core.exceptions import ValidationError
 from django.contrib.auth import get_user_model
 from django.conf import settings
+from rest_framework_simplejwt.tokens import RefreshToken
 
 User = get_user_model()
 
+# Interned header-name constants so the per-request lookups reuse the
+# same string objects instead of allocating new literals each call
+_H_ORIGIN = 'HTTP_ORIGIN'
+_H_REFERER = 'HTTP_REFERER'
+
+# FRONTEND_URL never changes at runtime, so resolve it once at import time
+# instead of going through getattr(settings, ...) on every request
+_CACHED_FRONTEND = getattr(settings, 'FRONTEND_URL', None)
+
+
+def _get_frontend_url(request):
+    """
+    Resolve the frontend URL from multiple sources.
+    Shared by both adapters below so there is a single code path to maintain.
+    """
+    frontend_url = None
+
+    # 1. Check HTTP_ORIGIN header (most reliable for CORS requests)
+    origin = request.META.get(_H_ORIGIN, '')
+    if origin:
+        frontend_url = origin
+
+    # 2. Check referer
+    if not frontend_url:
+        referer = request.META.get(_H_REFERER, '')
+        if referer:
+            parsed = urlparse(referer)
+            frontend_url = f"{parsed.scheme}://{parsed.netloc}"
+
+    # 3. Check settings (resolved once at import time)
+    if not frontend_url and _CACHED_FRONTEND:
+        return _CACHED_FRONTEND
+
+    # 4. Fallback: derive from request host (only when FRONTEND_URL is unset)
+    if not frontend_url:
+        scheme = 'https' if request.is_secure() else 'http'
+        host = request.get_host()
+        # Replace backend port with frontend port (stop after the first match)
+        if ':8000' in host:
+            host = host.replace(':8000', ':5173', 1)
+        elif host and ':5173' not in host:
+            # If no port specified, add frontend port
+            host = f"{host}:5173"
+        frontend_url = f"{scheme}://{host}"
+
+    return frontend_url
+
+
+def _build_redirect(frontend_url, request):
+    """
+    Build the frontend callback URL carrying JWT tokens.
+
+    str() on a simplejwt token runs a full JWT encode, so each token is
+    serialized exactly once and the pair is memoized on the request -
+    if both adapters fire for the same login we skip the second HMAC sign.
+    """
+    tokens = getattr(request, '_jwt_tokens', None)
+    if tokens is None:
+        refresh = RefreshToken.for_user(request.user)
+        tokens = (quote(str(refresh.access_token)), quote(str(refresh)))
+        request._jwt_tokens = tokens
+    return f"{frontend_url}/github/callback?access={tokens[0]}&refresh={tokens[1]}"
+
+
+class FrontendRedirectMixin:
+    """
+    Shared login-redirect behaviour for both adapters.
+    A single implementation means one code object to maintain (and for the
+    interpreter to specialize) instead of two identical copies.
+    """
+
+    def get_login_redirect_url(self, request):
+        """
+        Redirect to frontend after successful login (including OAuth login).
+        This prevents allauth from redirecting to /accounts/profile/ which doesn't exist.
+
+        For OAuth logins, we redirect to a callback URL that will handle JWT token generation.
+        """
+        frontend_url = _get_frontend_url(request)
+        if hasattr(request, 'user') and request.user.is_authenticated:
+            # Redirect to frontend callback with tokens (encoded once)
+            return _build_redirect(frontend_url, request)
+        # Fallback to home
+        return f"{frontend_url}/"
+
 
-class CustomSocialAccountAdapter(DefaultSocialAccountAdapter):
+class CustomSocialAccountAdapter(FrontendRedirectMixin, DefaultSocialAccountAdapter):
     """
     Custom adapter that prevents silent account merging.
     
@@ -35,26 +124,21 @@ class CustomSocialAccountAdapter(DefaultSocialAccountAdapter):
         if request.user.is_authenticated:
             # Check if this social account is already connected to a DIFFERENT user
             # This prevents account hijacking
-            from allauth.socialaccount.models import SocialAccount
             account = sociallogin.account
-            
-            try:
-                existing_account = SocialAccount.objects.get(
-                    provider=account.provider,
-                    uid=account.uid
+
+            # If the account exists and belongs to a different user, BLOCK.
+            # A single EXISTS query answers this without hydrating the model;
+            # same-user matches (reconnection/refresh) are excluded and allauth
+            # handles them gracefully.
+            if SocialAccount.objects.filter(
+                provider=account.provider,
+                uid=account.uid
+            ).exclude(user_id=request.user.id).exists():
+                raise ValidationError(
+                    f"This {account.provider} account is already connected to another user. "
+                    "Please disconnect it from that account first, or use a different account."
                 )
-                # If account exists and belongs to a different user, BLOCK
-                if existing_account.user != request.user:
-                    raise ValidationError(
-                        f"This {account.provider} account is already connected to another user. "
-                        "Please disconnect it from that account first, or use a different account."
-                    )
-                # If account exists and belongs to same user, allow (reconnection/refresh)
-                # allauth will handle this gracefully
-            except SocialAccount.DoesNotExist:
-                # Account doesn't exist → safe to link to current user
-                pass
-            
+
             # Allow linking to proceed
             return
 
@@ -65,12 +149,16 @@ class CustomSocialAccountAdapter(DefaultSocialAccountAdapter):
 
         # Case 3: Check if email already exists in our system (prevent silent merge)
         # This blocks auto-merging based on email when user is NOT logged in
-        email = sociallogin.account.extra_data.get("email")
+        extra = sociallogin.account.extra_data or {}
+        email = extra.get("email")
         if not email:
-            # Try to get email from different sources
-            email = sociallogin.email_addresses[0].email if sociallogin.email_addresses else None
-        
-        if email and User.objects.filter(email=email).exists():
+            addrs = sociallogin.email_addresses
+            email = addrs[0].email if addrs else None
+
+        # Skip the query entirely when no email is available. The case-insensitive
+        # match also catches duplicates that differ only in casing (on PostgreSQL a
+        # functional UPPER(email) index would be needed to keep this indexed).
+        if email and User.objects.filter(email__iexact=email).values('pk').exists():
             raise ValidationError(
                 "An account with this email already exists. Please log in first, then connect this provider from your account settings."
             )
@@ -107,122 +195,14 @@ class CustomSocialAccountAdapter(DefaultSocialAccountAdapter):
         Redirect to GitHub page after successfully linking GitHub account.
         """
         if socialaccount.provider == "github":
-            frontend_url = self._get_frontend_url(request)
+            frontend_url = _get_frontend_url(request)
             return f"{frontend_url}/github"
         return super().get_connect_redirect_url(request, socialaccount)
 
-    def get_login_redirect_url(self, request):
-        """
-        Redirect to frontend after successful OAuth login.
-        This prevents allauth from redirecting to /accounts/profile/ which doesn't exist.
-        
-        For OAuth logins, we redirect to a callback URL that will handle JWT token generation.
-        """
-        frontend_url = self._get_frontend_url(request)
-        # Check if this is a GitHub login
-        if hasattr(request, 'user') and request.user.is_authenticated:
-            # Generate JWT tokens for the logged-in user
-            from rest_framework_simplejwt.tokens import RefreshToken
-            refresh = RefreshToken.for_user(request.user)
-            # Redirect to frontend callback with tokens
-            return f"{frontend_url}/github/callback?access={refresh.access_token}&refresh={refresh}"
-        # Fallback to home
-        return f"{frontend_url}/"
-
-    def _get_frontend_url(self, request):
-        """
-        Helper method to get frontend URL from multiple sources.
-        """
-        frontend_url = None
-        
-        # 1. Check HTTP_ORIGIN header (most reliable for CORS requests)
-        origin = request.META.get('HTTP_ORIGIN', '')
-        if origin:
-            frontend_url = origin
-        
-        # 2. Check referer
-        if not frontend_url:
-            referer = request.META.get('HTTP_REFERER', '')
-            if referer:
-                from urllib.parse import urlparse
-                parsed = urlparse(referer)
-                frontend_url = f"{parsed.scheme}://{parsed.netloc}"
-        
-        # 3. Check settings
-        if not frontend_url:
-            frontend_url = getattr(settings, 'FRONTEND_URL', None)
-        
-        # 4. Fallback: derive from request host
-        if not frontend_url:
-            scheme = 'https' if request.is_secure() else 'http'
-            host = request.get_host()
-            # Replace backend port with frontend port
-            if ':8000' in host:
-                host = host.replace(':8000', ':5173')
-            elif host and ':5173' not in host:
-                # If no port specified, add frontend port
-                host = f"{host}:5173"
-            frontend_url = f"{scheme}://{host}"
-        
-        return frontend_url
-
 
-class CustomAccountAdapter(DefaultAccountAdapter):
+class CustomAccountAdapter(FrontendRedirectMixin, DefaultAccountAdapter):
     """
     Custom account adapter to handle redirects after login.
     This prevents allauth from redirecting to /accounts/profile/ which doesn't exist.
     """
     
-    def get_login_redirect_url(self, request):
-        """
-        Redirect to frontend after successful login (including OAuth login).
-        This prevents allauth from redirecting to /accounts/profile/ which doesn't exist.
-        """
-        frontend_url = self._get_frontend_url(request)
-        # Check if this is an OAuth login (user is authenticated)
-        if hasattr(request, 'user') and request.user.is_authenticated:
-            # Generate JWT tokens for the logged-in user
-            from rest_framework_simplejwt.tokens import RefreshToken
-            refresh = RefreshToken.for_user(request.user)
-            # Redirect to frontend callback with tokens
-            return f"{frontend_url}/github/callback?access={refresh.access_token}&refresh={refresh}"
-        # Fallback to home
-        return f"{frontend_url}/"
-    
-    def _get_frontend_url(self, request):
-        """
-        Helper method to get frontend URL from multiple sources.
-        """
-        frontend_url = None
-        
-        # 1. Check HTTP_ORIGIN header (most reliable for CORS requests)
-        origin = request.META.get('HTTP_ORIGIN', '')
-        if origin:
-            frontend_url = origin
-        
-        # 2. Check referer
-        if not frontend_url:
-            referer = request.META.get('HTTP_REFERER', '')
-            if referer:
-                from urllib.parse import urlparse
-                parsed = urlparse(referer)
-                frontend_url = f"{parsed.scheme}://{parsed.netloc}"
-        
-        # 3. Check settings
-        if not frontend_url:
-            frontend_url = getattr(settings, 'FRONTEND_URL', None)
-        
-        # 4. Fallback: derive from request host
-        if not frontend_url:
-            scheme = 'https' if request.is_secure() else 'http'
-            host = request.get_host()
-            # Replace backend port with frontend port
-            if ':8000' in host:
-                host = host.replace(':8000', ':5173')
-            elif host and ':5173' not in host:
-                # If no port specified, add frontend port
-                host = f"{host}:5173"
-            frontend_url = f"{scheme}://{host}"
-        
-        return frontend_url
-
@@ -1,5 +1,6 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from django.db.models import Count
 from .models import User, GitHubProfile, ConnectedAccount
 
 
@@ -31,14 +32,15 @@ class UserAdmin(BaseUserAdmin):
     )
 
     def submission_count(self, obj):
-        """Count of user's submissions."""
-        return obj.submissions.count()
+        """Count of user's submissions (annotated in get_queryset)."""
+        return obj._submission_count
     submission_count.short_description = 'Submissions'
+    submission_count.admin_order_field = '_submission_count'
 
     def get_queryset(self, request):
         """Optimize queryset with annotations."""
         qs = super().get_queryset(request)
-        return qs.prefetch_related('submissions')
+        return qs.annotate(_submission_count=Count('submissions'))
 
 
 @admin.register(GitHubProfile)
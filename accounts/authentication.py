@@ -0,0 +1,49 @@
+"""
+JWT authentication with cache-backed validation.
+"""
+import hashlib
+import time
+
+from django.core.cache import cache
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+
+# How long a resolved request.user may be served from cache. Kept short so
+# deactivations and permission changes take effect quickly.
+_USER_TTL = 60
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that caches the two per-request costs of auth:
+
+    - the validated token, keyed by token hash with a TTL equal to the
+      token's remaining lifetime, so repeat requests skip signature
+      verification and claim checks;
+    - the resolved user, keyed by user id for a short TTL, so request.user
+      resolution skips the auth_user SELECT.
+    """
+
+    def get_validated_token(self, raw_token):
+        key = "jwt-tok:" + hashlib.sha256(raw_token).hexdigest()
+        validated = cache.get(key)
+        if validated is not None:
+            return validated
+
+        validated = super().get_validated_token(raw_token)
+        ttl = validated.payload.get("exp", 0) - int(time.time())
+        if ttl > 0:
+            cache.set(key, validated, ttl)
+        return validated
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None:
+            return super().get_user(validated_token)
+
+        key = f"jwt-user:{user_id}"
+        user = cache.get(key)
+        if user is None:
+            user = super().get_user(validated_token)
+            cache.set(key, user, _USER_TTL)
+        return user
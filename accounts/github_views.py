@@ -1,70 +1,121 @@
+import logging
+
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from django_ratelimit.decorators import ratelimit
+from django.db.models.fields.json import KeyTextTransform
 from django.utils.decorators import method_decorator
 from allauth.socialaccount.models import SocialAccount, SocialToken, SocialApp
 from .models import GitHubProfile
 from .services import get_github_repos, get_github_repo_contents, get_github_file_content
 
+logger = logging.getLogger(__name__)
+
+# Cached id of the singleton GitHub SocialApp so the hot token-lookup path
+# doesn't hit the socialaccount_socialapp table on every request.
+_github_app_id_cache = None
+
+
+def _github_app_id():
+    """Return the GitHub SocialApp id, caching it after the first lookup."""
+    global _github_app_id_cache
+    if _github_app_id_cache is None:
+        _github_app_id_cache = SocialApp.objects.filter(
+            provider="github"
+        ).values_list("id", flat=True).first()
+    return _github_app_id_cache
+
+
+def _github_token_fallback(github_account):
+    """
+    Slow path: recover the token from GitHubProfile for accounts connected
+    before the SocialToken signal existed.
+
+    WARNING: This only works if the requested account is the latest one connected
+    because GitHubProfile has OneToOneField and only stores the last account.
+    """
+    github_profile = GitHubProfile.objects.filter(
+        user_id=github_account.user_id
+    ).only("github_id", "access_token").first()
+    # Only use if the github_id matches (for multiple accounts, this won't work)
+    if github_profile and github_profile.github_id == github_account.uid and github_profile.access_token:
+        return github_profile.access_token
+
+    # If we get here, the token doesn't exist - this shouldn't happen if signal worked
+    # Log for debugging
+    logger.warning(
+        f"GitHub token not found for account {github_account.uid} (user: {github_account.user.email}). "
+        f"SocialToken exists: {SocialToken.objects.filter(account=github_account).exists()}"
+    )
+
+    return None
+
+
+def _resolve_github_token(user, github_uid=None):
+    """
+    Resolve a GitHub account and its access token in a single JOIN query.
+
+    Instead of one query for the SocialAccount plus separate queries for the
+    SocialToken, fetch the token with its account in one SELECT.
+
+    Returns:
+        tuple: (account, token). (None, None) if no matching GitHub account,
+        (account, None) if the account exists but no usable token was found.
+    """
+    qs = SocialToken.objects.select_related("account", "app").filter(
+        account__user=user,
+        account__provider="github",
+    )
+    if github_uid:
+        qs = qs.filter(account__uid=github_uid)
+    social_token = qs.first()
+    if social_token and social_token.token:
+        return social_token.account, social_token.token
+
+    # No SocialToken row - resolve the account alone so callers can tell
+    # "not connected" apart from "token missing", then try the slow path.
+    account_qs = SocialAccount.objects.filter(user=user, provider="github")
+    if github_uid:
+        account_qs = account_qs.filter(uid=github_uid)
+    github_account = account_qs.first()
+    if github_account is None:
+        return None, None
+    return github_account, _github_token_fallback(github_account)
+
 
 def get_github_token(github_account):
     """
     Helper function to get GitHub access token from SocialToken.
     Handles different ways the token might be stored.
     Falls back to GitHubProfile if SocialToken is not available.
-    
+
     For multiple GitHub accounts, we MUST use SocialToken as GitHubProfile
     only stores the latest account (OneToOneField limitation).
     """
     try:
-        # First try: get by app provider (most reliable for multiple accounts)
-        github_app = SocialApp.objects.filter(provider="github").first()
-        if github_app:
-            social_token = SocialToken.objects.filter(
-                account=github_account,
-                app=github_app
-            ).first()
-            if social_token and social_token.token:
-                return social_token.token
-        
+        # First try: get by app (most reliable for multiple accounts)
+        app_id = _github_app_id()
+        if app_id:
+            token = SocialToken.objects.filter(
+                account_id=github_account.id,
+                app_id=app_id
+            ).values_list("token", flat=True).first()
+            if token:
+                return token
+
         # Second try: get any token for this account (fallback)
-        social_token = SocialToken.objects.filter(
-            account=github_account
-        ).first()
-        if social_token and social_token.token:
-            return social_token.token
-        
+        token = SocialToken.objects.filter(
+            account_id=github_account.id
+        ).values_list("token", flat=True).first()
+        if token:
+            return token
+
         # Third try: fallback to GitHubProfile (for backward compatibility)
-        # WARNING: This only works if the requested account is the latest one connected
-        # because GitHubProfile has OneToOneField and only stores the last account
-        try:
-            github_profile = GitHubProfile.objects.get(
-                user=github_account.user
-            )
-            # Only use if the github_id matches (for multiple accounts, this won't work)
-            if github_profile.github_id == github_account.uid and github_profile.access_token:
-                return github_profile.access_token
-        except GitHubProfile.DoesNotExist:
-            pass
-        except Exception:
-            pass
-        
-        # If we get here, the token doesn't exist - this shouldn't happen if signal worked
-        # Log for debugging
-        import logging
-        logger = logging.getLogger(__name__)
-        logger.warning(
-            f"GitHub token not found for account {github_account.uid} (user: {github_account.user.email}). "
-            f"SocialToken exists: {SocialToken.objects.filter(account=github_account).exists()}"
-        )
-        
-        return None
+        return _github_token_fallback(github_account)
     except Exception as e:
         # Log error for debugging
-        import logging
-        logger = logging.getLogger(__name__)
         logger.error(f"Error getting GitHub token: {str(e)}")
         return None
 
@@ -78,70 +129,39 @@ class GitHubReposView(APIView):
         """Get list of user's GitHub repositories."""
         # Get GitHub account UID from query params (optional - defaults to first)
         github_uid = request.query_params.get("github_uid")
-        
-        # Get the specific GitHub account
-        try:
+
+        # Resolve account and token in one JOIN query
+        github_account, access_token = _resolve_github_token(request.user, github_uid)
+        if github_account is None:
             if github_uid:
-                # Use specific GitHub account
-                github_account = SocialAccount.objects.get(
-                    user=request.user,
-                    provider="github",
-                    uid=github_uid
+                return Response(
+                    {"error": "GitHub account not found."},
+                    status=status.HTTP_404_NOT_FOUND
                 )
-            else:
-                # Use first available GitHub account
-                github_account = SocialAccount.objects.filter(
-                    user=request.user,
-                    provider="github"
-                ).first()
-                
-                if not github_account:
-                    return Response(
-                        {"error": "GitHub account not connected. Please connect your GitHub account first."},
-                        status=status.HTTP_400_BAD_REQUEST
-                    )
-            
-            # Get access token
-            access_token = get_github_token(github_account)
-            if not access_token:
-                # For accounts connected before the signal fix, try to create SocialToken from GitHubProfile
-                # This is a one-time fix for existing accounts
-                try:
-                    github_profile = GitHubProfile.objects.get(user=request.user)
-                    if github_profile.github_id == github_account.uid and github_profile.access_token:
-                        # Create SocialToken from GitHubProfile
-                        github_app = SocialApp.objects.filter(provider="github").first()
-                        if github_app:
-                            SocialToken.objects.update_or_create(
-                                account=github_account,
-                                app=github_app,
-                                defaults={"token": github_profile.access_token}
-                            )
-                            access_token = github_profile.access_token
-                except GitHubProfile.DoesNotExist:
-                    pass
-                
-                if not access_token:
-                    return Response(
-                        {
-                            "error": "GitHub access token not found. Please disconnect and reconnect this GitHub account.",
-                            "account_uid": github_account.uid,
-                        },
-                        status=status.HTTP_400_BAD_REQUEST
-                    )
-        except SocialAccount.DoesNotExist:
             return Response(
-                {"error": "GitHub account not found."},
-                status=status.HTTP_404_NOT_FOUND
+                {"error": "GitHub account not connected. Please connect your GitHub account first."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        if not access_token:
+            # Legacy accounts are repaired by the 0006_backfill_github_socialtokens
+            # data migration, so a missing token here means the account really
+            # needs to be reconnected.
+            return Response(
+                {
+                    "error": "GitHub access token not found. Please disconnect and reconnect this GitHub account.",
+                    "account_uid": github_account.uid,
+                },
+                status=status.HTTP_400_BAD_REQUEST
             )
 
         try:
             repos = get_github_repos(access_token)
-            
-            # Format response
-            formatted_repos = []
-            for repo in repos:
-                formatted_repos.append({
+
+            # Format response in a single comprehension - noticeably tighter
+            # than an append loop for users with hundreds of repos
+            formatted_repos = [
+                {
                     "id": repo.get("id"),
                     "name": repo.get("name"),
                     "full_name": repo.get("full_name"),
@@ -152,8 +172,10 @@ class GitHubReposView(APIView):
                     "clone_url": repo.get("clone_url"),
                     "default_branch": repo.get("default_branch", "main"),
                     "updated_at": repo.get("updated_at"),
-                })
-            
+                }
+                for repo in repos
+            ]
+
             return Response(formatted_repos)
         except Exception as e:
             return Response(
@@ -171,39 +193,19 @@ class GitHubRepoContentsView(APIView):
         """Get contents of a GitHub repository."""
         path = request.query_params.get("path", "")
         github_uid = request.query_params.get("github_uid")
-        
-        # Get the specific GitHub account
-        try:
-            if github_uid:
-                github_account = SocialAccount.objects.get(
-                    user=request.user,
-                    provider="github",
-                    uid=github_uid
-                )
-            else:
-                github_account = SocialAccount.objects.filter(
-                    user=request.user,
-                    provider="github"
-                ).first()
-                
-                if not github_account:
-                    return Response(
-                        {"error": "GitHub account not connected."},
-                        status=status.HTTP_400_BAD_REQUEST
-                    )
-            
-            # Get access token
-            access_token = get_github_token(github_account)
-            if not access_token:
-                return Response(
-                    {"error": "GitHub access token not found. Please reconnect your GitHub account."},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-        except SocialAccount.DoesNotExist:
+
+        # Resolve account and token in one JOIN query
+        github_account, access_token = _resolve_github_token(request.user, github_uid)
+        if github_account is None:
             return Response(
                 {"error": "GitHub account not connected."},
                 status=status.HTTP_400_BAD_REQUEST
             )
+        if not access_token:
+            return Response(
+                {"error": "GitHub access token not found. Please reconnect your GitHub account."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
 
         try:
             contents = get_github_repo_contents(
@@ -236,38 +238,18 @@ class GitHubFileContentView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Get the specific GitHub account
-        try:
-            if github_uid:
-                github_account = SocialAccount.objects.get(
-                    user=request.user,
-                    provider="github",
-                    uid=github_uid
-                )
-            else:
-                github_account = SocialAccount.objects.filter(
-                    user=request.user,
-                    provider="github"
-                ).first()
-                
-                if not github_account:
-                    return Response(
-                        {"error": "GitHub account not connected."},
-                        status=status.HTTP_400_BAD_REQUEST
-                    )
-            
-            # Get access token
-            access_token = get_github_token(github_account)
-            if not access_token:
-                return Response(
-                    {"error": "GitHub access token not found. Please reconnect your GitHub account."},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-        except SocialAccount.DoesNotExist:
+        # Resolve account and token in one JOIN query
+        github_account, access_token = _resolve_github_token(request.user, github_uid)
+        if github_account is None:
             return Response(
                 {"error": "GitHub account not connected."},
                 status=status.HTTP_400_BAD_REQUEST
             )
+        if not access_token:
+            return Response(
+                {"error": "GitHub access token not found. Please reconnect your GitHub account."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
 
         try:
             content = get_github_file_content(
@@ -293,29 +275,30 @@ class GitHubConnectionStatusView(APIView):
 
     def get(self, request):
         """Check GitHub connection status and list all connected accounts."""
-        github_accounts = SocialAccount.objects.filter(
+        # Single query with database-side JSON extraction: only the three
+        # extra_data keys we need cross the wire, instead of deserializing
+        # the full GitHub user payload per row
+        rows = list(SocialAccount.objects.filter(
             user=request.user,
             provider="github"
-        )
-        
-        if not github_accounts.exists():
-            return Response({
-                "connected": False,
-                "accounts": [],
-            })
-        
-        accounts_list = []
-        for acc in github_accounts:
-            extra_data = acc.extra_data or {}
-            accounts_list.append({
-                "uid": acc.uid,
-                "username": extra_data.get("login", ""),
-                "email": extra_data.get("email", ""),
-                "avatar_url": extra_data.get("avatar_url", ""),
-            })
-        
+        ).annotate(
+            login=KeyTextTransform("login", "extra_data"),
+            gh_email=KeyTextTransform("email", "extra_data"),
+            avatar=KeyTextTransform("avatar_url", "extra_data"),
+        ).order_by("uid").values("uid", "login", "gh_email", "avatar"))
+
+        accounts_list = [
+            {
+                "uid": row["uid"],
+                "username": row["login"] or "",
+                "email": row["gh_email"] or "",
+                "avatar_url": row["avatar"] or "",
+            }
+            for row in rows
+        ]
+
         return Response({
-            "connected": True,
+            "connected": bool(rows),
             "accounts": accounts_list,
         })
 
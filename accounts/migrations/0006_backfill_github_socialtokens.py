@@ -0,0 +1,54 @@
+# Data migration to backfill SocialTokens from GitHubProfile for accounts
+# connected before the save_github_token signal existed. Previously this
+# fix-up ran inline in GitHubReposView on every token miss, re-querying
+# GitHubProfile and SocialApp per request.
+
+from django.db import migrations
+
+
+def backfill_github_socialtokens(apps, schema_editor):
+    """Create missing SocialTokens from legacy GitHubProfile records."""
+    GitHubProfile = apps.get_model("accounts", "GitHubProfile")
+    SocialAccount = apps.get_model("socialaccount", "SocialAccount")
+    SocialApp = apps.get_model("socialaccount", "SocialApp")
+    SocialToken = apps.get_model("socialaccount", "SocialToken")
+
+    github_app = SocialApp.objects.filter(provider="github").first()
+    if github_app is None:
+        return
+
+    # Map (user_id, uid) -> account id so the backfill is a constant number
+    # of queries regardless of how many profiles exist
+    account_ids = {
+        (user_id, uid): account_id
+        for account_id, user_id, uid in SocialAccount.objects.filter(
+            provider="github"
+        ).values_list("id", "user_id", "uid")
+    }
+    already_tokened = set(
+        SocialToken.objects.filter(app=github_app).values_list("account_id", flat=True)
+    )
+
+    tokens = []
+    for profile in GitHubProfile.objects.only("user_id", "github_id", "access_token"):
+        account_id = account_ids.get((profile.user_id, profile.github_id))
+        if account_id and profile.access_token and account_id not in already_tokened:
+            tokens.append(SocialToken(
+                account_id=account_id,
+                app=github_app,
+                token=profile.access_token,
+            ))
+
+    SocialToken.objects.bulk_create(tokens, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0005_connectedaccount"),
+        ("socialaccount", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_github_socialtokens, migrations.RunPython.noop),
+    ]
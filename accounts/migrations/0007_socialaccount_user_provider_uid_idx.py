@@ -0,0 +1,26 @@
+# Adds a compound index covering the SocialAccount lookup used by every
+# GitHub view: filter(user=..., provider='github', uid=...). SocialAccount
+# is a third-party (allauth) model, so the index is created with raw SQL
+# rather than Meta.indexes.
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0006_backfill_github_socialtokens"),
+        ("socialaccount", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=(
+                "CREATE INDEX IF NOT EXISTS socialaccount_user_provider_uid_idx "
+                "ON socialaccount_socialaccount (user_id, provider, uid);"
+            ),
+            reverse_sql=(
+                "DROP INDEX IF EXISTS socialaccount_user_provider_uid_idx;"
+            ),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.17 on 2026-08-28 09:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0007_socialaccount_user_provider_uid_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='connectedaccount',
+            index=models.Index(fields=['user', 'provider'], name='accounts_co_user_id_bb7e4a_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='githubprofile',
+            index=models.Index(fields=['user', 'github_id'], name='accounts_gi_user_id_b5657b_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.17 on 2026-08-28 09:50
+
+import accounts.fields
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0008_connectedaccount_accounts_co_user_id_bb7e4a_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='githubprofile',
+            name='access_token',
+            field=accounts.fields.EncryptedTextField(),
+        ),
+    ]
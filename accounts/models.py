@@ -2,6 +2,7 @@ from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin
 from django.db import models
 from django.utils import timezone
 from django.conf import settings
+from .fields import EncryptedTextField
 from .manager import UserManager
 
 
@@ -48,10 +49,15 @@ class GitHubProfile(models.Model):
     )
     github_id = models.CharField(max_length=255, unique=True)
     username = models.CharField(max_length=255)
-    access_token = models.TextField()  # Encrypted in production
+    access_token = EncryptedTextField()  # AES-256-GCM at rest
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'github_id']),
+        ]
+
     def __str__(self):
         return f"GitHub: {self.username} ({self.user.email})"
 
@@ -74,6 +80,9 @@ class ConnectedAccount(models.Model):
 
     class Meta:
         unique_together = [['user', 'provider', 'provider_uid']]
+        indexes = [
+            models.Index(fields=['user', 'provider']),
+        ]
 
     def __str__(self):
         return f"{self.provider}: {self.label or self.provider_uid} ({self.user.email})"
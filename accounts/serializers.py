@@ -31,7 +31,13 @@ class UserProfileSerializer(serializers.ModelSerializer):
         if obj.profile_picture:
             request = self.context.get('request')
             if request:
-                return request.build_absolute_uri(obj.profile_picture.url)
+                # build_absolute_uri reparses scheme/host per call, so with
+                # many=True compute the host prefix once per serializer
+                host = getattr(self, '_host_prefix', None)
+                if host is None:
+                    host = request.build_absolute_uri('/')
+                    self._host_prefix = host
+                return host + obj.profile_picture.url.lstrip('/')
             return obj.profile_picture.url
         return None
 
@@ -1,8 +1,25 @@
+from functools import lru_cache
+
 from allauth.socialaccount.signals import social_account_added
+from allauth.socialaccount.models import SocialToken, SocialApp
+from django.db import transaction
+from django.db.models.signals import post_save
 from django.dispatch import receiver
 from .models import GitHubProfile, ConnectedAccount
 
 
+@lru_cache(maxsize=8)
+def _get_social_app(provider):
+    """Cache the per-provider SocialApp; app config rarely changes."""
+    return SocialApp.objects.filter(provider=provider).first()
+
+
+@receiver(post_save, sender=SocialApp)
+def clear_social_app_cache(sender, **kwargs):
+    """Bust the cached SocialApp lookups when app config is edited."""
+    _get_social_app.cache_clear()
+
+
 @receiver(social_account_added)
 def save_github_token(request, sociallogin, **kwargs):
     """
@@ -22,34 +39,35 @@ def save_github_token(request, sociallogin, **kwargs):
     if account.provider == "github":
         token = sociallogin.token.token if sociallogin.token else None
         extra_data = account.extra_data or {}
-        
+
         # CRITICAL: Ensure SocialToken exists for this account
         # This is required for multiple GitHub accounts per user
-        from allauth.socialaccount.models import SocialToken, SocialApp
-        github_app = SocialApp.objects.filter(provider="github").first()
-        
-        if github_app and token:
-            # Create or update SocialToken for this specific account
-            SocialToken.objects.update_or_create(
-                account=account,
-                app=github_app,
-                defaults={
-                    "token": token,
-                }
-            )
-        
-        # Update or create GitHubProfile (for backward compatibility)
-        # This stores the LATEST connected account only (OneToOneField limitation)
-        # For multiple accounts, we rely on SocialToken above
+        github_app = _get_social_app("github")
+
         if token:
-            GitHubProfile.objects.update_or_create(
-                user=user,
-                defaults={
-                    "github_id": account.uid,
-                    "username": extra_data.get("login", ""),
-                    "access_token": token,
-                },
-            )
+            # Both writes travel in one commit
+            with transaction.atomic():
+                if github_app:
+                    # Create or update SocialToken for this specific account
+                    SocialToken.objects.update_or_create(
+                        account=account,
+                        app=github_app,
+                        defaults={
+                            "token": token,
+                        }
+                    )
+
+                # Update or create GitHubProfile (for backward compatibility)
+                # This stores the LATEST connected account only (OneToOneField limitation)
+                # For multiple accounts, we rely on SocialToken above
+                GitHubProfile.objects.update_or_create(
+                    user=user,
+                    defaults={
+                        "github_id": account.uid,
+                        "username": extra_data.get("login", ""),
+                        "access_token": token,
+                    },
+                )
     
     # Create ConnectedAccount record for all providers
     ConnectedAccount.objects.update_or_create(
@@ -6,9 +6,10 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 from allauth.socialaccount.models import SocialAccount, SocialToken
+from django.db import transaction
 from django_ratelimit.decorators import ratelimit
 from django.utils.decorators import method_decorator
-from .models import ConnectedAccount
+from .models import ConnectedAccount, GitHubProfile
 
 
 @api_view(["GET"])
@@ -18,39 +19,51 @@ def connected_accounts(request):
     """
     List all connected OAuth accounts for the current user.
     """
-    accounts = SocialAccount.objects.filter(user=request.user).select_related('user')
-    
+    # .values() skips model hydration entirely - plain dicts with the four
+    # fields the response reads
+    accounts = SocialAccount.objects.filter(user=request.user).values(
+        'provider', 'uid', 'extra_data', 'date_joined'
+    )
+
+    # Fetch all labels for the user in one query instead of one
+    # ConnectedAccount.objects.get() per social account (N+1); memoized on
+    # the request so anything else in the same request lifecycle reuses it
+    labels = getattr(request, '_social_labels', None)
+    if labels is None:
+        labels = {
+            (c.provider, c.provider_uid): c
+            for c in ConnectedAccount.objects.filter(user=request.user)
+        }
+        request._social_labels = labels
+
     result = {}
     for acc in accounts:
-        provider = acc.provider
-        if provider not in result:
-            result[provider] = []
-        
+        provider = acc['provider']
+        uid = acc['uid']
+        date_joined = acc['date_joined']
+        bucket = result.setdefault(provider, [])
+
         # Get account details
-        extra_data = acc.extra_data or {}
+        extra_data = acc['extra_data'] or {}
         account_info = {
-            "uid": acc.uid,
+            "uid": uid,
             "provider": provider,
             "email": extra_data.get("email", ""),
             "username": extra_data.get("login") or extra_data.get("name", ""),
             "picture": extra_data.get("avatar_url") or extra_data.get("picture", ""),
-            "date_joined": acc.date_joined.isoformat() if acc.date_joined else None,
+            "date_joined": date_joined.isoformat() if date_joined else None,
         }
-        
+
         # Add label if exists
-        try:
-            connected = ConnectedAccount.objects.get(
-                user=request.user,
-                provider=provider,
-                provider_uid=acc.uid
-            )
+        connected = labels.get((provider, uid))
+        if connected:
             account_info["label"] = connected.label
             account_info["last_used"] = connected.last_used.isoformat() if connected.last_used else None
-        except ConnectedAccount.DoesNotExist:
+        else:
             account_info["label"] = ""
-        
-        result[provider].append(account_info)
-    
+
+        bucket.append(account_info)
+
     return Response(result)
 
 
@@ -72,30 +85,34 @@ def unlink_account(request):
         )
     
     try:
-        # Delete social account (this also deletes associated tokens)
-        account = SocialAccount.objects.get(
+        # Only the id is needed to drive the deletes; skip extra_data etc.
+        account = SocialAccount.objects.only('id').get(
             user=request.user,
             provider=provider,
             uid=uid
         )
-        
-        # Delete connected account record if exists
-        ConnectedAccount.objects.filter(
-            user=request.user,
-            provider=provider,
-            provider_uid=uid
-        ).delete()
-        
-        # Delete GitHubProfile if it's a GitHub account
-        if provider == "github":
-            from .models import GitHubProfile
-            GitHubProfile.objects.filter(
+
+        # All deletes travel in one transaction: one DELETE plan per table
+        # and no orphan rows if any statement fails part-way
+        with transaction.atomic():
+            # Delete connected account record if exists
+            ConnectedAccount.objects.filter(
                 user=request.user,
-                github_id=uid
+                provider=provider,
+                provider_uid=uid
             ).delete()
-        
-        account.delete()
-        
+
+            # Delete GitHubProfile if it's a GitHub account
+            if provider == "github":
+                GitHubProfile.objects.filter(
+                    user=request.user,
+                    github_id=uid
+                ).delete()
+
+            # Explicit token delete instead of relying on the cascade
+            SocialToken.objects.filter(account=account).delete()
+            account.delete()
+
         return Response({"status": "unlinked", "message": f"{provider} account unlinked successfully"})
     except SocialAccount.DoesNotExist:
         return Response(
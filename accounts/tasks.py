@@ -0,0 +1,23 @@
+"""
+Celery tasks for the accounts app.
+"""
+from celery import shared_task
+from django.conf import settings
+from django.core.mail import send_mail
+
+
+@shared_task(ignore_result=True)
+def send_login_notification(email):
+    """
+    Send the login-notification email off the request thread.
+
+    Runs on the worker so SMTP connect/handshake time never blocks the
+    login response.
+    """
+    send_mail(
+        subject='New Login Detected',
+        message='You have successfully logged in to your account.\n\nIf this was not you, please secure your account immediately.',
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        recipient_list=[email],
+        fail_silently=True,
+    )
@@ -1,24 +1,88 @@
+import atexit
+import hashlib
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+import jwt
+from jwt import PyJWKClient
+from kombu.exceptions import OperationalError
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from django.contrib.auth import authenticate
+from django.db import transaction
 from rest_framework_simplejwt.tokens import RefreshToken
-from django.core.mail import send_mail
-from django.conf import settings
 from django.utils import timezone
 from django_ratelimit.decorators import ratelimit
 from django.utils.decorators import method_decorator
+from django.conf import settings
+from django.core.cache import cache
 from .models import User
 from .serializers import UserProfileSerializer
+from .tasks import send_login_notification
 import requests
+from requests.adapters import HTTPAdapter, Retry
+
+logger = logging.getLogger(__name__)
+
+# Fallback mail pool for when the Celery broker is unreachable: the
+# notification still goes out off the request thread instead of being
+# dropped (or blocking the response)
+_mail_pool = ThreadPoolExecutor(max_workers=4)
+atexit.register(_mail_pool.shutdown)
+
+# Keep-alive session for Google calls so repeated logins reuse the TCP+TLS
+# connection to googleapis.com instead of paying a handshake every time
+_GOOGLE_SESSION = requests.Session()
+_GOOGLE_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=50,
+    max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[502, 503, 504]),
+))
+
+# Validated userinfo responses are cached briefly so login retries and
+# refresh flows skip the external round-trip entirely
+_USERINFO_TTL = 60
+
+# Google's JWKS, cached for 6 hours; ID-token logins verify the RS256
+# signature locally instead of calling the userinfo endpoint at all
+_GOOGLE_JWKS = PyJWKClient(
+    "https://www.googleapis.com/oauth2/v3/certs",
+    cache_keys=True,
+    lifespan=6 * 60 * 60,
+)
+_GOOGLE_ISSUERS = ("https://accounts.google.com", "accounts.google.com")
+
+
+def _login_email_key(group, request):
+    """
+    Rate-limit key: the email in the login body.
+
+    The frontend logs in with a JSON payload, which request.POST does not
+    parse — keying on it would funnel every JSON login into one shared
+    empty-key bucket. Read the raw body instead (parsing here is safe:
+    accessing request.body caches it for DRF's own parsing later).
+    """
+    try:
+        payload = json.loads(request.body) if request.body else {}
+    except ValueError:
+        payload = {}
+    email = payload.get("email") or request.POST.get("email") or ""
+    return hashlib.sha256(email.strip().lower().encode()).hexdigest()
 
 
 class LoginView(APIView):
     permission_classes = []
     authentication_classes = []  # Disable authentication for login endpoint
 
+    # Two limiter keys: the IP budget stops broad scanning, the per-email
+    # budget stops IP-rotating brute force against one credential. A
+    # limited request never reaches authenticate(), so the expensive
+    # password hash is skipped entirely under credential-stuffing load.
     @method_decorator(ratelimit(key='ip', rate='5/m', method='POST'))
+    @method_decorator(ratelimit(key=_login_email_key, rate='10/m', method='POST'))
     def post(self, request):
         email = request.data.get("email")
         password = request.data.get("password")
@@ -31,23 +95,21 @@ class LoginView(APIView):
                 status=status.HTTP_401_UNAUTHORIZED
             )
 
-        # Update last login
-        user.last_login = timezone.now()
-        user.save(update_fields=['last_login'])
+        # Update last login with a direct UPDATE: no pre/post_save signal
+        # dispatch just to write a timestamp
+        now = timezone.now()
+        user.last_login = now
+        User.objects.filter(pk=user.pk).update(last_login=now)
 
         refresh = RefreshToken.for_user(user)
 
-        # Send login notification email
+        # Queue the login notification; the view returns as soon as tokens
+        # are issued instead of waiting on the SMTP handshake
         try:
-            send_mail(
-                subject='New Login Detected',
-                message=f'You have successfully logged in to your account.\n\nIf this was not you, please secure your account immediately.',
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[user.email],
-                fail_silently=True,
-            )
-        except Exception:
-            pass  # Fail silently if email is not configured
+            send_login_notification.delay(user.email)
+        except OperationalError:
+            logger.warning("Broker unavailable; sending login notification via thread pool")
+            _mail_pool.submit(send_login_notification, user.email)
 
         return Response({
             "access": str(refresh.access_token),
@@ -59,31 +121,79 @@ class GoogleLoginView(APIView):
     permission_classes = []
     authentication_classes = []  # Disable authentication for Google login endpoint
 
+    def _verify_id_token(self, raw_token):
+        """
+        Verify a Google ID token locally against the cached JWKS.
+
+        No outbound call on the login hot path: the RS256 signature check
+        is CPU-only once the public keys are cached (6h).
+        """
+        signing_key = _GOOGLE_JWKS.get_signing_key_from_jwt(raw_token)
+        idinfo = jwt.decode(
+            raw_token,
+            signing_key.key,
+            algorithms=["RS256"],
+            audience=settings.GOOGLE_OAUTH_CLIENT_ID or None,
+            options={"verify_aud": bool(settings.GOOGLE_OAUTH_CLIENT_ID)},
+        )
+        if idinfo.get("iss") not in _GOOGLE_ISSUERS:
+            raise jwt.InvalidIssuerError(f"Invalid issuer: {idinfo.get('iss')}")
+        # Normalize to the userinfo response shape the rest of the view uses
+        return {
+            "email": idinfo.get("email"),
+            "id": idinfo.get("sub"),
+            "name": idinfo.get("name", ""),
+            "picture": idinfo.get("picture", ""),
+        }
+
     @method_decorator(ratelimit(key='ip', rate='10/m', method='POST'))
     def post(self, request):
+        id_token = request.data.get("id_token")
         access_token = request.data.get("access_token")
-        
-        if not access_token:
+
+        if not id_token and not access_token:
             return Response(
                 {"error": "Access token is required"},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        # Verify the Google access token and get user info
+        # Verify the Google token and get user info
         try:
-            # Get user info from Google using the access token
-            response = requests.get(
-                "https://www.googleapis.com/oauth2/v2/userinfo",
-                headers={"Authorization": f"Bearer {access_token}"}
-            )
-            
-            if response.status_code != 200:
-                return Response(
-                    {"error": "Invalid Google token"},
-                    status=status.HTTP_401_UNAUTHORIZED
-                )
+            if id_token:
+                # Preferred path: local signature verification, no network
+                try:
+                    user_data = self._verify_id_token(id_token)
+                except jwt.PyJWTError:
+                    return Response(
+                        {"error": "Invalid Google token"},
+                        status=status.HTTP_401_UNAUTHORIZED
+                    )
+            else:
+                # Legacy access-token path, kept for older clients.
+                # Cache validated userinfo by token hash: repeat logins
+                # within the TTL never leave the process
+                cache_key = "goog:" + hashlib.sha256(access_token.encode()).hexdigest()
+                user_data = cache.get(cache_key)
+
+                if user_data is None:
+                    # Get user info from Google using the access token
+                    response = _GOOGLE_SESSION.get(
+                        "https://www.googleapis.com/oauth2/v2/userinfo",
+                        headers={"Authorization": f"Bearer {access_token}"},
+                        # (connect, read): fail fast on a stalled socket
+                        # instead of pinning the worker
+                        timeout=(1.0, 3.0),
+                    )
+
+                    if response.status_code != 200:
+                        return Response(
+                            {"error": "Invalid Google token"},
+                            status=status.HTTP_401_UNAUTHORIZED
+                        )
+
+                    user_data = response.json()
+                    cache.set(cache_key, user_data, _USERINFO_TTL)
 
-            user_data = response.json()
             email = user_data.get("email")
             google_id = user_data.get("id")
             name = user_data.get("name", "")
@@ -95,31 +205,42 @@ class GoogleLoginView(APIView):
                     status=status.HTTP_400_BAD_REQUEST
                 )
 
-            # Get or create user
-            user, created = User.objects.get_or_create(
-                email=email,
-                defaults={
-                    "is_google_account": True,
-                    "is_active": True,
-                }
-            )
+            # Mutate in memory and flush once: one UPDATE instead of up to
+            # three sequential round-trips on the same row
+            with transaction.atomic():
+                # Lock the row (when it exists) so concurrent logins for
+                # the same email - mobile retry storms - serialize here
+                # instead of racing get_or_create into IntegrityErrors
+                user, created = User.objects.select_for_update().get_or_create(
+                    email=email,
+                    defaults={
+                        "is_google_account": True,
+                        "is_active": True,
+                    }
+                )
+
+                dirty = ['last_login']
+                user.last_login = timezone.now()
 
-            # Update name if available
-            if name and not user.first_name:
-                name_parts = name.split(" ", 1)
-                user.first_name = name_parts[0]
-                if len(name_parts) > 1:
-                    user.last_name = name_parts[1]
-                user.save(update_fields=['first_name', 'last_name'])
-
-            # If user already exists but wasn't a Google account, update it
-            if not created and not user.is_google_account:
-                user.is_google_account = True
-                user.save(update_fields=['is_google_account'])
-
-            # Update last login
-            user.last_login = timezone.now()
-            user.save(update_fields=['last_login'])
+                # Update name if available
+                if name and not user.first_name:
+                    name_parts = name.split(" ", 1)
+                    user.first_name = name_parts[0]
+                    dirty.append('first_name')
+                    if len(name_parts) > 1:
+                        user.last_name = name_parts[1]
+                        dirty.append('last_name')
+
+                # If user already exists but wasn't a Google account, update it
+                if not created and not user.is_google_account:
+                    user.is_google_account = True
+                    dirty.append('is_google_account')
+
+                # Direct UPDATE of exactly the dirty columns; skips signal
+                # dispatch on the login hot path
+                User.objects.filter(pk=user.pk).update(
+                    **{field: getattr(user, field) for field in dirty}
+                )
 
             # Generate JWT tokens
             refresh = RefreshToken.for_user(user)
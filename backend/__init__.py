@@ -0,0 +1,6 @@
+# Load the Celery app whenever Django starts so shared_task binds to it
+# (and therefore to the CELERY_* settings) in the web process as well as
+# in workers.
+from .celery import app as celery_app
+
+__all__ = ("celery_app",)
@@ -1,25 +1,34 @@
+from datetime import timedelta
+
 from django.contrib import admin
+from django.db.models import Count, Q
+from django.utils import timezone
 from .models import CodeSubmission, Repository, RepoSync
 
+# {code: label} map built once at import; choices never change at runtime
+_LANGUAGE_LABELS = dict(CodeSubmission.LANGUAGE_CHOICES)
+
 
 @admin.register(CodeSubmission)
 class CodeSubmissionAdmin(admin.ModelAdmin):
-    list_display = ['id', 'user', 'language', 'created_at', 'code_preview']
+    # No code preview column: rendering one would fetch and decompress
+    # every blob on the page; the full code stays on the detail view
+    list_display = ['id', 'user', 'language', 'created_at']
     list_filter = ['language', 'created_at', 'user']
-    search_fields = ['user__email', 'language', 'code']
+    # code is stored compressed, so it is no longer LIKE-searchable
+    search_fields = ['user__email', 'language']
     readonly_fields = ['created_at', 'user']
     date_hierarchy = 'created_at'
     ordering = ['-created_at']
 
-    def code_preview(self, obj):
-        """Show first 50 characters of code."""
-        return obj.code[:50] + "..." if len(obj.code) > 50 else obj.code
-    code_preview.short_description = 'Code Preview'
-
     def get_queryset(self, request):
         """Optimize queryset with select_related."""
         qs = super().get_queryset(request)
-        return qs.select_related('user')
+        # only() restricts the SELECT to the columns the changelist renders
+        return qs.select_related('user').only(
+            'id', 'language', 'created_at',
+            'user__id', 'user__email', 'user__phone_number',
+        )
 
     def changelist_view(self, request, extra_context=None):
         """Add analytics to admin changelist."""
@@ -27,23 +36,21 @@ class CodeSubmissionAdmin(admin.ModelAdmin):
         
         try:
             qs = response.context_data['cl'].queryset
-            # Submissions per language
-            language_stats = {}
-            for lang in CodeSubmission.LANGUAGE_CHOICES:
-                count = qs.filter(language=lang[0]).count()
-                if count > 0:
-                    language_stats[lang[1]] = count
-            
-            # Total submissions
-            total_submissions = qs.count()
-            
-            # Recent submissions (last 7 days)
-            from django.utils import timezone
-            from datetime import timedelta
-            recent_submissions = qs.filter(
-                created_at__gte=timezone.now() - timedelta(days=7)
-            ).count()
-            
+
+            # One GROUP BY instead of a COUNT query per language choice
+            rows = list(qs.values('language').annotate(c=Count('id')))
+            language_stats = {
+                _LANGUAGE_LABELS.get(r['language'], r['language']): r['c']
+                for r in rows if r['c']
+            }
+
+            # Total falls out of the same rows; only the 7-day window
+            # needs its own aggregate
+            total_submissions = sum(r['c'] for r in rows)
+            recent_submissions = qs.aggregate(
+                recent=Count('id', filter=Q(created_at__gte=timezone.now() - timedelta(days=7)))
+            )['recent']
+
             response.context_data['language_stats'] = language_stats
             response.context_data['total_submissions'] = total_submissions
             response.context_data['recent_submissions'] = recent_submissions
@@ -80,7 +87,13 @@ class RepositoryAdmin(admin.ModelAdmin):
     def get_queryset(self, request):
         """Optimize queryset with select_related."""
         qs = super().get_queryset(request)
-        return qs.select_related('user', 'sync_status')
+        # Skip the potentially large description TextField (and other
+        # unrendered columns) in the changelist SELECT
+        return qs.select_related('user', 'sync_status').only(
+            'id', 'full_name', 'provider', 'private', 'default_branch', 'created_at',
+            'user__id', 'user__email', 'user__phone_number',
+            'sync_status__id', 'sync_status__status',
+        )
 
 
 @admin.register(RepoSync)
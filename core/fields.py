@@ -0,0 +1,41 @@
+"""
+Custom model fields for the core app.
+"""
+import zlib
+
+from django.db import models
+
+# Compressed payloads carry a short magic prefix so rows written before
+# compression existed still read back unchanged.
+_MAGIC = b"zlib\x00"
+
+
+class CompressedTextField(models.BinaryField):
+    """
+    BinaryField that stores text compressed and exposes it as str.
+
+    Source code compresses roughly 3-5x, shrinking row size, DB I/O and
+    backup volume by the same factor; compression costs microseconds for
+    typical submissions. Uses zlib from the standard library.
+    """
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault("editable", True)
+        super().__init__(*args, **kwargs)
+
+    def get_prep_value(self, value):
+        if isinstance(value, str):
+            value = _MAGIC + zlib.compress(value.encode(), 6)
+        return super().get_prep_value(value)
+
+    def from_db_value(self, value, expression, connection):
+        return self.to_python(value)
+
+    def to_python(self, value):
+        if value is None or isinstance(value, str):
+            return value
+        value = bytes(value)
+        if value.startswith(_MAGIC):
+            return zlib.decompress(value[len(_MAGIC):]).decode()
+        # Legacy uncompressed row (stored as text before this field)
+        return value.decode()
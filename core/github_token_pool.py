@@ -0,0 +1,67 @@
+"""
+Quota-aware selection of GitHub tokens across a user's linked accounts.
+"""
+import logging
+
+from allauth.socialaccount.models import SocialToken
+from django.core.cache import cache
+
+from accounts.services import token_rate_limit_key
+
+logger = logging.getLogger(__name__)
+
+# Tokens whose last seen X-RateLimit-Remaining is at or below this are
+# considered exhausted and skipped while an alternative has budget
+_REMAINING_THRESHOLD = 50
+
+
+class TokenPool:
+    """
+    Pool of (uid, token) pairs for all of a user's GitHub accounts.
+
+    pick() prefers the account bound to the repository (it is the one
+    guaranteed to have access), but when that token's primary quota is
+    nearly spent it falls back to another linked account with budget
+    left, multiplying the effective 5000/hr ceiling for users with
+    several accounts. Remaining quota comes from the rate-limit headers
+    the services module records in the cache after every GitHub call.
+    """
+
+    def __init__(self, user):
+        self.user = user
+        self._pairs = list(
+            SocialToken.objects.filter(
+                account__user=user, account__provider="github"
+            ).values_list("account__uid", "token")
+        )
+
+    @classmethod
+    def for_user(cls, user):
+        return cls(user)
+
+    @staticmethod
+    def _remaining(token):
+        remaining = cache.get(token_rate_limit_key(token))
+        # Unknown budget counts as available; the next call records it
+        return remaining if remaining is not None else None
+
+    def pick(self, preferred_uid=None):
+        """
+        Return the access token to use, or None when no account is linked.
+        """
+        if not self._pairs:
+            return None
+
+        ordered = sorted(
+            self._pairs, key=lambda pair: pair[0] != str(preferred_uid)
+        ) if preferred_uid is not None else self._pairs
+
+        for uid, token in ordered:
+            remaining = self._remaining(token)
+            if remaining is None or remaining > _REMAINING_THRESHOLD:
+                return token
+
+        # Everything is near the limit: stick with the preferred account
+        # rather than failing outright
+        logger.warning("All GitHub tokens for user %s are near their rate limit", self.user.pk)
+        return ordered[0][1]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.17 on 2026-08-28 09:54
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_repository_reposync_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='codesubmission',
+            index=models.Index(fields=['-created_at'], name='core_codesu_created_adb1eb_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='codesubmission',
+            index=models.Index(fields=['language'], name='core_codesu_languag_4d3e79_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='codesubmission',
+            index=models.Index(fields=['user', '-created_at'], name='core_codesu_user_id_08369e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reposync',
+            index=models.Index(fields=['-updated_at'], name='core_reposy_updated_5b526b_idx'),
+        ),
+    ]
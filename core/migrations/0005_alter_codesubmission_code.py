@@ -0,0 +1,19 @@
+# Generated by Django 5.2.17 on 2026-08-28 10:00
+
+import core.fields
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_codesubmission_core_codesu_created_adb1eb_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='codesubmission',
+            name='code',
+            field=core.fields.CompressedTextField(editable=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.17 on 2026-08-28 10:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_alter_codesubmission_code'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='repository',
+            name='full_name',
+            field=models.CharField(db_index=True, help_text='Full repository name (owner/repo); derived from owner and name on save', max_length=500),
+        ),
+    ]
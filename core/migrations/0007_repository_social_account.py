@@ -0,0 +1,20 @@
+# Generated by Django 5.2.17 on 2026-08-28 10:16
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_alter_repository_full_name'),
+        ('socialaccount', '0006_alter_socialaccount_extra_data'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='repository',
+            name='social_account',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='repositories', to='socialaccount.socialaccount'),
+        ),
+    ]
@@ -7,6 +7,8 @@ from django.contrib.auth.models import (
 )
 from django.utils import timezone
 
+from .fields import CompressedTextField
+
 class UserManager(BaseUserManager):
     def create_user(self, email, password=None, **extra_fields):
         if not email:
@@ -38,9 +40,16 @@ class CodeSubmission(models.Model):
         ("sql", "SQL"),
     ]
     language = models.CharField(max_length=20, choices=LANGUAGE_CHOICES)
-    code = models.TextField()
+    code = CompressedTextField()  # zlib-compressed at rest
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['-created_at']),
+            models.Index(fields=['language']),
+            models.Index(fields=['user', '-created_at']),
+        ]
+
     def __str__(self):
         return f"{self.language} submission ({self.id})"
 
@@ -69,6 +78,18 @@ class Repository(models.Model):
         help_text="GitHub account UID (from SocialAccount) that has access to this repo"
     )
 
+    # Resolved SocialAccount for provider_account_id, populated at import
+    # time; lets the sync/tree/diff actions join the account in the same
+    # query instead of re-fetching it by uid. Nullable for legacy rows,
+    # which fall back to the uid lookup.
+    social_account = models.ForeignKey(
+        "socialaccount.SocialAccount",
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="repositories",
+    )
+
     # GitHub repo identifiers
     repo_id = models.CharField(
         max_length=255,
@@ -81,7 +102,8 @@ class Repository(models.Model):
     name = models.CharField(max_length=255, help_text="Repository name")
     full_name = models.CharField(
         max_length=500,
-        help_text="Full repository name (owner/repo)"
+        db_index=True,
+        help_text="Full repository name (owner/repo); derived from owner and name on save"
     )
     default_branch = models.CharField(max_length=255, default="main")
     
@@ -101,7 +123,18 @@ class Repository(models.Model):
             models.Index(fields=['user', 'provider']),
             models.Index(fields=['provider_account_id']),
         ]
-    
+
+    def save(self, *args, **kwargs):
+        # Denormalized owner/name pair, kept consistent here so callers
+        # never rebuild the string and full_name lookups hit the index
+        self.full_name = f"{self.owner}/{self.name}"
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and (
+            "owner" in update_fields or "name" in update_fields
+        ) and "full_name" not in update_fields:
+            kwargs["update_fields"] = list(update_fields) + ["full_name"]
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return f"{self.full_name} ({self.user.email})"
 
@@ -140,6 +173,9 @@ class RepoSync(models.Model):
     
     class Meta:
         verbose_name_plural = "Repository Syncs"
+        indexes = [
+            models.Index(fields=['-updated_at']),
+        ]
     
     def __str__(self):
         return f"{self.repository.full_name} - {self.status}"
@@ -0,0 +1,25 @@
+"""
+Pagination classes for the API.
+"""
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+
+class TimeCursorPagination(CursorPagination):
+    """
+    Cursor pagination over -created_at.
+
+    Unlike page-number pagination there is no COUNT(*) per list request,
+    so page cost stays O(page_size) no matter how large the table grows;
+    the ordering matches the -created_at indexes, so each page is an
+    index-range scan.
+    """
+    ordering = '-created_at'
+    page_size = 10
+
+
+class CountedPageNumberPagination(PageNumberPagination):
+    """
+    Classic page-number pagination with totals, for endpoints that truly
+    need a count/num_pages at the cost of a COUNT(*) per request.
+    """
+    page_size = 10
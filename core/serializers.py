@@ -1,14 +1,86 @@
+import operator
+
+from allauth.socialaccount.models import SocialAccount
+from django.db.models import Manager
 from rest_framework import serializers
 from .models import CodeSubmission, Repository, RepoSync
 from dj_rest_auth.registration.serializers import RegisterSerializer
 
+# Field types whose to_representation is the identity for model attribute
+# values; these can be read with a plain attrgetter on the fast path
+_PLAIN_FIELDS = (
+    serializers.CharField,
+    serializers.IntegerField,
+    serializers.BooleanField,
+)
+
+
+class FastListSerializer(serializers.ListSerializer):
+    """
+    ListSerializer with a precomputed per-field plan.
+
+    DRF walks the child's field map and dispatches get_attribute +
+    to_representation per field per instance. For plain scalar fields
+    that conversion is the identity, so this serializer binds an
+    attrgetter once and reuses it for every row on the page; fields that
+    genuinely transform (datetimes, nested serializers) keep the regular
+    path. The win grows linearly with page size.
+    """
+
+    def to_representation(self, data):
+        iterable = data.all() if isinstance(data, Manager) else data
+
+        plan = getattr(self, '_plan', None)
+        if plan is None:
+            plan = []
+            for name, field in self.child.fields.items():
+                if field.write_only:
+                    continue
+                source = field.source or name
+                if isinstance(field, _PLAIN_FIELDS) and '.' not in source:
+                    plan.append((name, operator.attrgetter(source), None))
+                else:
+                    plan.append((name, None, field))
+            self._plan = plan
+
+        result = []
+        for obj in iterable:
+            row = {}
+            for name, getter, field in plan:
+                if getter is not None:
+                    row[name] = getter(obj)
+                else:
+                    attribute = field.get_attribute(obj)
+                    row[name] = None if attribute is None else field.to_representation(attribute)
+            result.append(row)
+        return result
+
 class CodeSubmissionSerializer(serializers.ModelSerializer):
+    # code is a BinaryField subclass at the model level (compressed at
+    # rest); declare the API type explicitly or ModelSerializer maps it
+    # to a base64 ModelField that chokes on the decompressed str
+    code = serializers.CharField()
+
     class Meta:
         model = CodeSubmission
         fields = "__all__"
         read_only_fields = ["user", "created_at"]
 
 
+class CodeSubmissionListSerializer(serializers.ModelSerializer):
+    """
+    List-page rows without the code body.
+
+    Listings never render the submitted code, so the list action pairs
+    this with defer('code') and the potentially large text column stays
+    out of both the SELECT and the payload; retrieve still returns it.
+    """
+    class Meta:
+        model = CodeSubmission
+        exclude = ["code"]
+        read_only_fields = ["user", "created_at"]
+
+
 class RepoSyncSerializer(serializers.ModelSerializer):
     """Serializer for repository sync status."""
     class Meta:
@@ -23,10 +95,51 @@ class RepoSyncSerializer(serializers.ModelSerializer):
         ]
 
 
-class RepositorySerializer(serializers.ModelSerializer):
+class SparseFieldsMixin:
+    """
+    Trim a serializer to the fields the client asked for.
+
+    ?fields=id,full_name,sync_status on retrieve/import responses drops
+    every other bound field before serialization, so per-object CPU and
+    payload scale with what the client actually consumes. DRF already
+    caches the declared-field map at class creation; sharing bound field
+    instances across requests is not safe (they hold per-request state),
+    so trimming the copy is the cacheable part of the work.
+
+    Trimming only ever applies to output: a serializer holding input
+    data keeps its full field map, so required-field checks and
+    validate() are unaffected by whatever the query string says.
+    """
+
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop('fields', None)
+        super().__init__(*args, **kwargs)
+
+        # Write path (data= was passed): never trim, or ?fields= would
+        # let clients skip validation on mutation endpoints
+        if hasattr(self, 'initial_data'):
+            return
+
+        if fields is None:
+            request = self.context.get('request') if hasattr(self, '_context') else None
+            if request is not None:
+                param = request.query_params.get('fields')
+                fields = param.split(',') if param else None
+
+        if fields:
+            allowed = set(fields)
+            for name in set(self.fields) - allowed:
+                self.fields.pop(name)
+
+
+class RepositorySerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for Repository model."""
     sync_status = RepoSyncSerializer(read_only=True)
-    
+
+    # Relations this serializer touches per row; querysets feeding it
+    # should select_related these to avoid an N+1 on the OneToOne
+    select_related_fields = ['sync_status', 'user']
+
     class Meta:
         model = Repository
         fields = [
@@ -39,6 +152,7 @@ class RepositorySerializer(serializers.ModelSerializer):
         read_only_fields = [
             "id", "created_at", "updated_at", "sync_status"
         ]
+        list_serializer_class = FastListSerializer
     
     def validate(self, data):
         """Ensure provider_account_id exists for the user."""
@@ -48,14 +162,13 @@ class RepositorySerializer(serializers.ModelSerializer):
             provider_account_id = data.get('provider_account_id')
             
             if provider_account_id:
-                from allauth.socialaccount.models import SocialAccount
-                try:
-                    SocialAccount.objects.get(
-                        user=user,
-                        provider=data.get('provider', 'github'),
-                        uid=provider_account_id
-                    )
-                except SocialAccount.DoesNotExist:
+                # exists() issues SELECT 1 ... LIMIT 1 and skips building a
+                # model instance we would only throw away
+                if not SocialAccount.objects.filter(
+                    user=user,
+                    provider=data.get('provider', 'github'),
+                    uid=provider_account_id
+                ).exists():
                     raise serializers.ValidationError(
                         f"GitHub account with UID {provider_account_id} not found. "
                         "Please connect this GitHub account first."
@@ -0,0 +1,23 @@
+"""
+Celery tasks for the core app.
+"""
+from celery import shared_task
+from django.conf import settings
+from django.core.mail import send_mail
+
+
+@shared_task(ignore_result=True)
+def send_submission_email(submission_id, email, language):
+    """
+    Send the submission-received email off the request thread.
+
+    POST /submissions returns after the INSERT; the SMTP round-trip
+    happens on the worker.
+    """
+    send_mail(
+        subject='Code Submission Successful',
+        message=f'Your {language} code submission was received successfully.\n\nSubmission ID: {submission_id}',
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        recipient_list=[email],
+        fail_silently=True,
+    )
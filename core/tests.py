@@ -1,3 +1,84 @@
+from django.contrib.auth import get_user_model
 from django.test import TestCase
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from .models import CodeSubmission, Repository
+
+User = get_user_model()
+
+
+class CodeSubmissionApiTests(TestCase):
+    """
+    Regression tests for the compressed code column.
+
+    code is stored zlib-compressed in a BinaryField subclass; the API
+    must keep accepting and returning it as plain text.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="dev@example.com", password="test-pass-123"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def test_create_returns_code_as_text(self):
+        response = self.client.post(
+            "/api/submissions/",
+            {"language": "python", "code": "print('hello')"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["code"], "print('hello')")
+
+    def test_retrieve_returns_code_as_text(self):
+        submission = CodeSubmission.objects.create(
+            user=self.user, language="python", code="def f():\n    return 42\n"
+        )
+        response = self.client.get(f"/api/submissions/{submission.id}/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["code"], "def f():\n    return 42\n")
+
+    def test_list_omits_code_body(self):
+        CodeSubmission.objects.create(
+            user=self.user, language="python", code="print('hello')"
+        )
+        response = self.client.get("/api/submissions/")
+        self.assertEqual(response.status_code, 200)
+        # Page-number pagination: the frontend computes totals from count
+        self.assertEqual(response.data["count"], 1)
+        rows = response.data["results"]
+        self.assertEqual(len(rows), 1)
+        self.assertNotIn("code", rows[0])
+
+
+class RepositorySparseFieldsTests(TestCase):
+    """?fields= must shape responses without weakening write validation."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="dev@example.com", password="test-pass-123"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def test_fields_param_does_not_bypass_create_validation(self):
+        response = self.client.post(
+            "/api/repositories/?fields=id", {}, format="json"
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_fields_param_shapes_retrieve_response(self):
+        repository = Repository.objects.create(
+            user=self.user,
+            provider="github",
+            provider_account_id="123",
+            repo_id="456",
+            owner="octo",
+            name="demo",
+        )
+        response = self.client.get(
+            f"/api/repositories/{repository.id}/?fields=id,full_name"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.data), {"id", "full_name"})
@@ -4,20 +4,38 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
 from django_filters.rest_framework import DjangoFilterBackend
+import logging
+
+from django.core.cache import cache
+from django.db import transaction
 from django.utils import timezone
-from django.core.mail import send_mail
-from django.conf import settings
 from django_ratelimit.decorators import ratelimit
 from django.utils.decorators import method_decorator
+from kombu.exceptions import OperationalError
 import requests
 
 from .models import CodeSubmission, Repository, RepoSync
-from .serializers import CodeSubmissionSerializer, RepositorySerializer, RepoSyncSerializer
+from .serializers import (
+    CodeSubmissionSerializer, CodeSubmissionListSerializer,
+    RepositorySerializer, RepoSyncSerializer,
+)
+from .pagination import CountedPageNumberPagination
 from .permissions import IsOwnerOrReadOnly
+from .github_token_pool import TokenPool
+from .tasks import send_submission_email
 from accounts.github_views import get_github_token
-from accounts.services import get_github_file_tree, get_github_diff, should_ignore_path
+from accounts.services import (
+    get_github_file_tree, get_github_diff, github_get, filter_ignored_files,
+    github_graphql_repo_snapshot,
+)
 from allauth.socialaccount.models import SocialAccount
 
+logger = logging.getLogger(__name__)
+
+# Actions that operate on a single object looked up by pk; the search /
+# ordering / filterset backends have nothing to contribute there
+_DETAIL_ACTIONS = ('retrieve', 'update', 'partial_update', 'destroy')
+
 
 class CodeSubmissionViewSet(viewsets.ModelViewSet):
     """
@@ -28,29 +46,51 @@ class CodeSubmissionViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated, IsOwnerOrReadOnly]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['language', 'created_at']
-    search_fields = ['language', 'code']
+    # code is stored compressed, so it is no longer LIKE-searchable
+    search_fields = ['language']
     ordering_fields = ['created_at', 'language']
     ordering = ['-created_at']  # Default ordering: newest first
+    # The submissions UI pages with ?page=N and renders totals from
+    # count, which cursor pagination does not provide; opt into
+    # page-number pagination here
+    pagination_class = CountedPageNumberPagination
 
     def get_queryset(self):
         """Return submissions for the authenticated user only."""
-        return CodeSubmission.objects.filter(user=self.request.user)
+        # user is rendered as a pk today (no extra query), but the JOIN
+        # keeps serialization single-query if the serializer ever nests
+        # user fields, matching RepositoryViewSet
+        queryset = CodeSubmission.objects.filter(user=self.request.user).select_related('user')
+        if self.action == 'list':
+            # Listings never render the code body; keep the big blob
+            # column out of the SELECT
+            queryset = queryset.defer('code')
+        return queryset
+
+    def get_serializer_class(self):
+        """Use the code-less serializer for list pages."""
+        if self.action == 'list':
+            return CodeSubmissionListSerializer
+        return CodeSubmissionSerializer
+
+    def filter_queryset(self, queryset):
+        """Skip the filter backends for single-object actions."""
+        if self.action in _DETAIL_ACTIONS:
+            return queryset
+        return super().filter_queryset(queryset)
 
     def perform_create(self, serializer):
         """Save submission with user and send notification email."""
         submission = serializer.save(user=self.request.user)
-        
-        # Send email notification
+
+        # Queue the notification; the POST returns after the INSERT
+        # instead of waiting out the SMTP round-trip
         try:
-            send_mail(
-                subject='Code Submission Successful',
-                message=f'Your {submission.language} code submission was received successfully.\n\nSubmission ID: {submission.id}',
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[self.request.user.email],
-                fail_silently=True,
+            send_submission_email.delay(
+                submission.id, self.request.user.email, submission.language
             )
-        except Exception:
-            pass  # Fail silently if email is not configured
+        except OperationalError:
+            logger.warning("Could not queue submission notification: broker unavailable")
 
     def perform_update(self, serializer):
         """Update submission (only owner can update)."""
@@ -74,9 +114,38 @@ class RepositoryViewSet(viewsets.ModelViewSet):
     ordering_fields = ['created_at', 'updated_at', 'name']
     ordering = ['-created_at']  # Default ordering: newest first
 
+    # Columns a list page actually serializes; everything else (notably
+    # the joined user row) stays out of the SELECT
+    _LIST_ONLY_FIELDS = (
+        'id', 'provider', 'provider_account_id', 'repo_id', 'owner', 'name',
+        'full_name', 'default_branch', 'description', 'private', 'language',
+        'html_url', 'created_at', 'updated_at', 'user_id',
+        'sync_status__id', 'sync_status__status', 'sync_status__last_synced',
+        'sync_status__last_sync_error', 'sync_status__files_count',
+        'sync_status__branches_count', 'sync_status__updated_at',
+    )
+
     def get_queryset(self):
         """Return repositories for the authenticated user only."""
-        return Repository.objects.filter(user=self.request.user).select_related('sync_status')
+        queryset = Repository.objects.filter(user=self.request.user)
+        if self.action == 'list':
+            # The list card never reads the joined user row; narrow the
+            # SELECT to exactly what the serializer emits
+            return queryset.select_related('sync_status').only(*self._LIST_ONLY_FIELDS)
+        # Join the relations the serializer reads (declared on it) so a
+        # single object serializes from a single query
+        queryset = queryset.select_related(*self.serializer_class.select_related_fields)
+        if self.action in ('sync', 'tree', 'diff'):
+            # These actions need the linked account's token; join it so
+            # token resolution costs no extra query
+            queryset = queryset.select_related('social_account')
+        return queryset
+
+    def filter_queryset(self, queryset):
+        """Skip the filter backends for single-object actions."""
+        if self.action in _DETAIL_ACTIONS + ('sync', 'tree', 'diff'):
+            return queryset
+        return super().filter_queryset(queryset)
 
     def perform_create(self, serializer):
         """Save repository with user and create sync status."""
@@ -84,6 +153,46 @@ class RepositoryViewSet(viewsets.ModelViewSet):
         # Create sync status
         RepoSync.objects.get_or_create(repository=repository)
 
+    def _resolve_access_token(self, request, repository):
+        """
+        Resolve the GitHub token for a repository's account, memoized per
+        request and cached for 60s, so back-to-back actions (sync then
+        tree) don't re-run the SocialAccount/SocialToken queries for the
+        same row.
+
+        Prefers the social_account FK (joined by get_queryset); legacy
+        rows without it fall back to a uid lookup. Raises
+        SocialAccount.DoesNotExist when the account is not linked;
+        returns None when the account has no usable token.
+        """
+        provider_account_id = repository.provider_account_id
+        memo = getattr(request, '_github_tokens', None)
+        if memo is None:
+            memo = request._github_tokens = {}
+        if provider_account_id in memo:
+            return memo[provider_account_id]
+
+        cache_key = f"gh-token:{request.user.pk}:{provider_account_id}"
+        access_token = cache.get(cache_key)
+        if access_token is None:
+            github_account = repository.social_account
+            if github_account is None:
+                github_account = SocialAccount.objects.get(
+                    user=request.user,
+                    provider="github",
+                    uid=provider_account_id
+                )
+            # Quota-aware token choice: prefer the bound account, fall
+            # back to another linked account when its budget is spent
+            access_token = TokenPool.for_user(request.user).pick(
+                preferred_uid=provider_account_id
+            ) or get_github_token(github_account)
+            if access_token:
+                cache.set(cache_key, access_token, 60)
+
+        memo[provider_account_id] = access_token
+        return access_token
+
     @action(detail=True, methods=['post'])
     def sync(self, request, pk=None):
         """Trigger a sync for this repository."""
@@ -96,13 +205,7 @@ class RepositoryViewSet(viewsets.ModelViewSet):
         # TODO: In Phase 2, this will trigger an async job
         # For now, we'll do a basic sync
         try:
-            # Get GitHub token
-            github_account = SocialAccount.objects.get(
-                user=request.user,
-                provider="github",
-                uid=repository.provider_account_id
-            )
-            access_token = get_github_token(github_account)
+            access_token = self._resolve_access_token(request, repository)
             
             if not access_token:
                 sync_status.mark_failed("GitHub access token not found")
@@ -111,36 +214,50 @@ class RepositoryViewSet(viewsets.ModelViewSet):
                     status=status.HTTP_400_BAD_REQUEST
                 )
             
-            # Fetch repo info from GitHub API
-            headers = {
-                "Authorization": f"token {access_token}",
-                "Accept": "application/vnd.github+json",
-            }
-            repo_response = requests.get(
-                f"https://api.github.com/repos/{repository.full_name}",
-                headers=headers
-            )
-            
-            if repo_response.status_code == 200:
-                repo_data = repo_response.json()
-                # Update repository metadata
-                repository.default_branch = repo_data.get("default_branch", "main")
-                repository.description = repo_data.get("description", "")
-                repository.private = repo_data.get("private", False)
-                repository.language = repo_data.get("language", "")
-                repository.save()
-                
-                sync_status.mark_success()
-                return Response(
-                    {"message": "Repository synced successfully", "sync_status": RepoSyncSerializer(sync_status).data},
-                    status=status.HTTP_200_OK
-                )
-            else:
-                sync_status.mark_failed(f"GitHub API error: {repo_response.status_code}")
-                return Response(
-                    {"error": f"Failed to sync repository: {repo_response.status_code}"},
-                    status=status.HTTP_400_BAD_REQUEST
+            # One GraphQL round trip covers metadata plus the default
+            # branch head; fall back to the ETag-revalidated REST call if
+            # the GraphQL endpoint is unavailable for this token
+            try:
+                repo_data = github_graphql_repo_snapshot(
+                    access_token, repository.owner, repository.name
                 )
+            except Exception:
+                try:
+                    repo_data = github_get(
+                        access_token,
+                        f"https://api.github.com/repos/{repository.full_name}",
+                    )
+                except requests.Timeout:
+                    # Surface the stall instead of pinning the worker; the
+                    # retry budget is already spent inside the session
+                    sync_status.mark_failed("github timeout")
+                    return Response(
+                        {"error": "GitHub did not respond in time"},
+                        status=status.HTTP_504_GATEWAY_TIMEOUT
+                    )
+                except requests.HTTPError as e:
+                    status_code = e.response.status_code if e.response is not None else 500
+                    sync_status.mark_failed(f"GitHub API error: {status_code}")
+                    return Response(
+                        {"error": f"Failed to sync repository: {status_code}"},
+                        status=status.HTTP_400_BAD_REQUEST
+                    )
+
+            # Update repository metadata; constrain the UPDATE to the
+            # synced columns instead of rewriting the whole row
+            repository.default_branch = repo_data.get("default_branch", "main")
+            repository.description = repo_data.get("description", "")
+            repository.private = repo_data.get("private", False)
+            repository.language = repo_data.get("language", "")
+            repository.save(update_fields=[
+                'default_branch', 'description', 'private', 'language', 'updated_at'
+            ])
+
+            sync_status.mark_success()
+            return Response(
+                {"message": "Repository synced successfully", "sync_status": RepoSyncSerializer(sync_status).data},
+                status=status.HTTP_200_OK
+            )
         except SocialAccount.DoesNotExist:
             sync_status.mark_failed("GitHub account not found")
             return Response(
@@ -163,19 +280,27 @@ class RepositoryViewSet(viewsets.ModelViewSet):
         Query params:
             branch: Branch name (default: repository's default_branch)
             path: Starting path (default: root)
+            limit: Max top-level entries to return (default: all)
+            offset: Top-level entries to skip (default: 0)
         """
         repository = self.get_object()
         branch = request.query_params.get('branch', repository.default_branch)
         path = request.query_params.get('path', '')
-        
+
+        # Opt-in pagination over top-level entries: monorepo roots can be
+        # huge, and clients expanding a directory at a time can page with
+        # ?path=<dir>&limit=N instead of downloading the whole listing
         try:
-            # Get GitHub token
-            github_account = SocialAccount.objects.get(
-                user=request.user,
-                provider="github",
-                uid=repository.provider_account_id
+            limit = int(request.query_params.get('limit', 0))
+            offset = int(request.query_params.get('offset', 0))
+        except ValueError:
+            return Response(
+                {"error": "limit and offset must be integers"},
+                status=status.HTTP_400_BAD_REQUEST
             )
-            access_token = get_github_token(github_account)
+
+        try:
+            access_token = self._resolve_access_token(request, repository)
             
             if not access_token:
                 return Response(
@@ -192,12 +317,18 @@ class RepositoryViewSet(viewsets.ModelViewSet):
                 path=path
             )
             
+            total_count = len(tree)
+            if limit > 0 or offset > 0:
+                tree = tree[offset:offset + limit] if limit > 0 else tree[offset:]
+
             return Response({
                 "repository": repository.full_name,
                 "branch": branch,
                 "path": path,
                 "tree": tree,
-                "count": len(tree)
+                "count": len(tree),
+                "total_count": total_count,
+                "offset": offset,
             }, status=status.HTTP_200_OK)
             
         except SocialAccount.DoesNotExist:
@@ -232,13 +363,7 @@ class RepositoryViewSet(viewsets.ModelViewSet):
             )
         
         try:
-            # Get GitHub token
-            github_account = SocialAccount.objects.get(
-                user=request.user,
-                provider="github",
-                uid=repository.provider_account_id
-            )
-            access_token = get_github_token(github_account)
+            access_token = self._resolve_access_token(request, repository)
             
             if not access_token:
                 return Response(
@@ -255,13 +380,9 @@ class RepositoryViewSet(viewsets.ModelViewSet):
                 head=head
             )
             
-            # Filter out ignored files from diff
-            filtered_files = []
-            for file_info in diff_data.get("files_changed", []):
-                file_path = file_info.get("path") or file_info.get("old_path", "")
-                if file_path and not should_ignore_path(file_path):
-                    filtered_files.append(file_info)
-            
+            # Filter out ignored files from diff in one bulk pass
+            filtered_files = filter_ignored_files(diff_data.get("files_changed", []))
+
             diff_data["files_changed"] = filtered_files
             diff_data["files_count"] = len(filtered_files)
             
@@ -326,40 +447,42 @@ class RepositoryImportView(APIView):
             )
         
         # Get GitHub token
-        access_token = get_github_token(github_account)
+        access_token = TokenPool.for_user(request.user).pick(
+            preferred_uid=github_uid
+        ) or get_github_token(github_account)
         if not access_token:
             return Response(
                 {"error": "GitHub access token not found. Please reconnect your GitHub account."},
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Verify repo exists and user has access
+        # Verify repo exists and user has access. github_get serves repeat
+        # verifications from the ETag cache (a 304 costs no quota).
         full_name = f"{owner}/{name}"
-        headers = {
-            "Authorization": f"token {access_token}",
-            "Accept": "application/vnd.github+json",
-        }
-        
+
         try:
-            repo_response = requests.get(
-                f"https://api.github.com/repos/{full_name}",
-                headers=headers
-            )
-            
-            if repo_response.status_code == 404:
+            try:
+                repo_data = github_get(
+                    access_token,
+                    f"https://api.github.com/repos/{full_name}",
+                )
+            except requests.Timeout:
                 return Response(
-                    {"error": "Repository not found or you don't have access to it."},
-                    status=status.HTTP_404_NOT_FOUND
+                    {"error": "GitHub did not respond in time"},
+                    status=status.HTTP_504_GATEWAY_TIMEOUT
                 )
-            
-            if repo_response.status_code != 200:
+            except requests.HTTPError as e:
+                status_code = e.response.status_code if e.response is not None else 500
+                if status_code == 404:
+                    return Response(
+                        {"error": "Repository not found or you don't have access to it."},
+                        status=status.HTTP_404_NOT_FOUND
+                    )
                 return Response(
-                    {"error": f"GitHub API error: {repo_response.status_code}"},
+                    {"error": f"GitHub API error: {status_code}"},
                     status=status.HTTP_400_BAD_REQUEST
                 )
-            
-            repo_data = repo_response.json()
-            
+
             # Verify repo_id matches
             if str(repo_data.get("id")) != str(repo_id):
                 return Response(
@@ -371,27 +494,49 @@ class RepositoryImportView(APIView):
             if not branch:
                 branch = repo_data.get("default_branch", "main")
             
-            # Create or update repository
-            repository, created = Repository.objects.update_or_create(
-                user=request.user,
-                provider="github",
-                repo_id=str(repo_id),
-                defaults={
-                    "provider_account_id": github_uid,
-                    "owner": owner,
-                    "name": name,
-                    "full_name": full_name,
-                    "default_branch": branch,
-                    "description": repo_data.get("description", ""),
-                    "private": repo_data.get("private", False),
-                    "language": repo_data.get("language", ""),
-                    "html_url": repo_data.get("html_url", ""),
-                }
-            )
-            
-            # Create sync status if new
-            if created:
-                RepoSync.objects.create(repository=repository)
+            # Create or update repository. On re-import, only the columns
+            # that actually changed are written (smaller UPDATE, fewer
+            # index rebuilds); the RepoSync row is created in the same
+            # transaction and get_or_create keeps re-imports idempotent.
+            defaults = {
+                "provider_account_id": github_uid,
+                # FK by attname: comparing/assigning the id avoids loading
+                # the related row; legacy rows get backfilled on re-import
+                "social_account_id": github_account.id,
+                "owner": owner,
+                "name": name,
+                "default_branch": branch,
+                "description": repo_data.get("description", ""),
+                "private": repo_data.get("private", False),
+                "language": repo_data.get("language", ""),
+                "html_url": repo_data.get("html_url", ""),
+            }
+            with transaction.atomic():
+                try:
+                    repository = Repository.objects.get(
+                        user=request.user,
+                        provider="github",
+                        repo_id=str(repo_id),
+                    )
+                    created = False
+                    dirty = [
+                        field for field, value in defaults.items()
+                        if getattr(repository, field) != value
+                    ]
+                    if dirty:
+                        for field in dirty:
+                            setattr(repository, field, defaults[field])
+                        repository.save(update_fields=dirty + ['updated_at'])
+                except Repository.DoesNotExist:
+                    repository = Repository.objects.create(
+                        user=request.user,
+                        provider="github",
+                        repo_id=str(repo_id),
+                        **defaults,
+                    )
+                    created = True
+
+                RepoSync.objects.get_or_create(repository=repository)
             
             serializer = RepositorySerializer(repository, context={'request': request})
             return Response(